@@ -1,6 +1,11 @@
 import json
+import logging
+import os
+import re
+from types import MappingProxyType
 from google.adk.agents import LlmAgent, SequentialAgent, LoopAgent
 from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.readonly_context import ReadonlyContext
 from google.adk.tools.tool_context import ToolContext
 from google.adk.tools.base_tool import BaseTool
 from google.genai import types
@@ -11,26 +16,75 @@ from .test_case_designer import test_case_designer_agent
 from .test_implementer import test_implementer_agent
 from .test_runner import test_runner_agent
 from .debugger_and_refiner import debugger_and_refiner_agent
+from .llm_cache import enable_llm_cache
 from tools.workflow_tools import exit_loop
 
+# Log level is read once at import (main.py loads `.env` before importing the
+# agents); defaults to WARNING so routine INFO messages cost nothing unless
+# explicitly enabled. Unknown level names fall back to WARNING as well.
+logger = logging.getLogger("testmozart")
+_log_level = logging.getLevelName(os.environ.get("TESTMOZART_LOG_LEVEL", "WARNING").upper())
+logger.setLevel(_log_level if isinstance(_log_level, int) else logging.WARNING)
+
+# orjson is considerably faster than the stdlib for the (potentially large)
+# payloads we serialize on every agent turn. Fall back to `json` if missing.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj, indent: bool = False) -> str:
+    """Serializes `obj` to a JSON string, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None).decode()
+    return json.dumps(obj, indent=2 if indent else None)
+
+
+def _loads(text: str):
+    """Parses a JSON string, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
 # --- State Initialization ---
 
+# Read-only template for the initial test results; each session gets its own copy
+# so that later writes can never leak into the shared default.
+_DEFAULT_TEST_RESULTS = MappingProxyType({"status": "UNKNOWN"})
+
+# Session state key `main.py` uses to hand over the request without putting the
+# source code in the user message. It is consumed by the first turn only.
+SEEDED_REQUEST_KEY = "seeded_request"
+
 def initialize_state(callback_context: CallbackContext):
-    """Parses the initial user message and populates the session state."""
-    user_content = callback_context.user_content
-    if user_content and user_content.parts:
+    """Populates the session state from a seeded request or the user message."""
+    state = callback_context.state
+    seeded_request = state.get(SEEDED_REQUEST_KEY)
+    if seeded_request:
+        state['source_code'] = seeded_request.get('source_code')
+        state['language'] = seeded_request.get('language')
+        # Clear it so later messages in the same session (e.g. under `adk web`)
+        # are parsed from the user message instead of reusing this code.
+        state[SEEDED_REQUEST_KEY] = None
+    else:
+        user_content = callback_context.user_content
+        if not (user_content and user_content.parts):
+            return
         try:
-            initial_data = json.loads(user_content.parts[0].text)
-            callback_context.state['source_code'] = initial_data.get('source_code')
-            callback_context.state['language'] = initial_data.get('language')
-            # Initialize test_results to ensure the final agent doesn't fail
-            # if the loop is skipped or fails early.
-            callback_context.state['test_results'] = {"status": "UNKNOWN"}
+            initial_data = _loads(user_content.parts[0].text)
+            state['source_code'] = initial_data.get('source_code')
+            state['language'] = initial_data.get('language')
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, so this covers both.
         except (json.JSONDecodeError, AttributeError):
-            print("Warning: Could not parse initial JSON request. Treating content as raw source code.")
-            callback_context.state['source_code'] = user_content.parts[0].text
-            callback_context.state['language'] = 'python'
-            callback_context.state['test_results'] = {"status": "UNKNOWN"}
+            logger.warning("Could not parse initial JSON request. Treating content as raw source code.")
+            state['source_code'] = user_content.parts[0].text
+            state['language'] = 'python'
+    # Initialize test_results to ensure the final agent doesn't fail
+    # if the loop is skipped or fails early.
+    state['test_results'] = dict(_DEFAULT_TEST_RESULTS)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Initialized state for %s source (%d chars).", state.get('language'), len(state.get('source_code') or ''))
 
 
 
@@ -50,49 +104,83 @@ def save_analysis_to_state(tool: BaseTool, args: dict, tool_context: ToolContext
 
 # --- Configure Individual Agents for the Workflow ---
 
-# 1. CodeAnalyzer: Use the callback to save output.
+# Dynamic state is always appended at the very end of a prompt so the static
+# instruction text forms a stable prefix for provider-side prompt caching.
+
+# 1. CodeAnalyzer: Read `source_code` & `language`, use the callback to save output.
+# The source lives in the session state rather than the user message.
+code_analyzer_agent.instruction += "\n\nThe language and source code are provided below.\n\nINPUT:\n- language: {language}\n- source_code:\n{source_code}"
 code_analyzer_agent.after_tool_callback = save_analysis_to_state
 
 # 2. TestCaseDesigner: Read from `static_analysis_report`, save to `test_scenarios`.
-test_case_designer_agent.instruction += "\n\nYou will receive the static analysis report in the `{static_analysis_report}` state variable."
+test_case_designer_agent.instruction += "\n\nThe static analysis report is provided below.\n\nINPUT:\n{static_analysis_report}"
 test_case_designer_agent.output_key = "test_scenarios"
 
 # 3. TestImplementer: Read from `test_scenarios`, save to `generated_test_code`.
-test_implementer_agent.instruction += "\n\nYou will receive the test scenarios in the `{test_scenarios}` state variable."
+test_implementer_agent.instruction += "\n\nThe test scenarios are provided below.\n\nINPUT:\n{test_scenarios}"
 test_implementer_agent.output_key = "generated_test_code"
 
 # 4. TestRunner: Read `source_code` & `generated_test_code`, save to `test_results`.
-async def build_test_runner_instruction(ctx: CallbackContext) -> str:
-    """Dynamically creates the prompt for the test runner with code from the state."""
-    source_code = ctx.state.get('source_code', '')
-    generated_code = ctx.state.get('generated_test_code', '')
-
-    source_code_json_str = json.dumps(source_code)
-    generated_code_json_str = json.dumps(generated_code)
-    
-    return f"""
+# Kept byte-identical across calls; only the INPUT block below it varies.
+_TEST_RUNNER_PREFIX = """
     You are a highly reliable test execution engine. Your task is to execute a test suite against source code.
 
-    First, call the `execute_tests_sandboxed` tool with the following two arguments:
-    - `source_code_under_test`: Set this to the string {source_code_json_str}
-    - `generated_test_code`: Set this to the string {generated_code_json_str}
+    Call the `execute_and_parse_tests` tool exactly once, with the `source_code_under_test` and `generated_test_code` arguments set to the exact contents of the corresponding code blocks in the INPUT section below.
 
-    Second, take the entire, raw JSON output from `execute_tests_sandboxed` and immediately pass it as the `raw_execution_output` argument to the `parse_test_results` tool.
-    Your final output must be only the structured JSON object returned by the `parse_test_results` tool. Do not add any commentary or explanation.
+    Your final output must be only the structured JSON object returned by the `execute_and_parse_tests` tool. Do not add any commentary or explanation.
     """
+
+_BACKTICK_RUN_PATTERN = re.compile(r"`+")
+
+def _fenced(code: str) -> str:
+    """Wraps `code` in a fence longer than any backtick run inside it, so it can't close early."""
+    longest = max((len(run) for run in _BACKTICK_RUN_PATTERN.findall(code)), default=0)
+    fence = "`" * max(3, longest + 1)
+    return f"{fence}\n{code}\n{fence}"
+
+# Instruction providers receive a ReadonlyContext: they may only read state.
+async def build_test_runner_instruction(ctx: ReadonlyContext) -> str:
+    """Dynamically creates the prompt for the test runner with code from the state."""
+    state = ctx.state
+    source_code = state.get('source_code') or ''
+    generated_code = state.get('generated_test_code') or ''
+
+    # Fenced blocks embed the code verbatim: no per-character JSON escaping,
+    # fewer prompt tokens, and easier for the model to read.
+    return (
+        f"{_TEST_RUNNER_PREFIX}\n"
+        "INPUT:\n"
+        f"- source_code_under_test:\n{_fenced(source_code)}\n"
+        f"- generated_test_code:\n{_fenced(generated_code)}\n"
+    )
 test_runner_agent.instruction = build_test_runner_instruction
 test_runner_agent.output_key = "test_results"
 
 
+def _format_state_value(value) -> str:
+    """Renders a state value for a prompt; agent text outputs are already strings."""
+    return value if isinstance(value, str) else _dumps(value, indent=True)
+
+
+def _render_debugger_input(static_analysis_report, generated_test_code, test_results) -> str:
+    """Builds the dynamic INPUT block of the debugger prompt."""
+    return (
+        "INPUT:\n"
+        f"- static_analysis_report:\n{_format_state_value(static_analysis_report)}\n"
+        f"- generated_test_code:\n{_format_state_value(generated_test_code)}\n"
+        f"- test_results:\n{_format_state_value(test_results)}\n"
+    )
+
+
 # 5. DebuggerAndRefiner: Read all context, save corrected code back to `generated_test_code`.
 debugger_and_refiner_agent.tools.append(exit_loop)
-debugger_and_refiner_agent.instruction = """
+_DEBUGGER_PREFIX = """
 You are an expert Senior Software Debugging Engineer. Your sole purpose is to analyze a failed test run and fix the generated test code.
 
-You have access to the following information from the shared state:
-- `{static_analysis_report}`: A JSON report describing the original source code's structure.
-- `{generated_test_code}`: The full Python test code that failed. This is the code you must fix.
-- `{test_results}`: A structured JSON report from the test runner, detailing the failure.
+You will be given the following information from the shared state in the INPUT section at the end of this prompt:
+- `static_analysis_report`: A JSON report describing the original source code's structure.
+- `generated_test_code`: The full Python test code that failed. This is the code you must fix.
+- `test_results`: A structured JSON report from the test runner, detailing the failure.
 
 Your task is to meticulously analyze the `test_results`. If the `status` is "PASS", your job is done and you MUST call the `exit_loop` tool immediately.
 
@@ -103,7 +191,52 @@ If the `status` is "FAIL", you must rewrite the `generated_test_code` to fix the
 - If tests failed, your output MUST be only the complete, corrected Python test code.
 - Ensure the corrected code includes the necessary imports to run, such as `import pytest` and importing the code under test from `source_to_test` (e.g., `from source_to_test import YourClass, your_function`).
 - Do NOT include any explanations, comments, or markdown formatting like ```python.
+
 """
+
+async def build_debugger_instruction(ctx: ReadonlyContext) -> str:
+    """Creates the debugger prompt: the static instructions followed by the current state."""
+    state = ctx.state
+    return _DEBUGGER_PREFIX + _render_debugger_input(
+        state.get('static_analysis_report'),
+        state.get('generated_test_code'),
+        state.get('test_results'),
+    )
+
+
+def _test_status(test_results):
+    """
+    Returns the `status` field of the test results. The runner's output is
+    stored as text (possibly wrapped in a markdown fence), so parse it first.
+    """
+    if isinstance(test_results, str):
+        start, end = test_results.find('{'), test_results.rfind('}')
+        if start == -1 or end < start:
+            return None
+        try:
+            test_results = _loads(test_results[start:end + 1])
+        except json.JSONDecodeError:
+            return None
+    if isinstance(test_results, dict):
+        return test_results.get('status')
+    return None
+
+
+def skip_debugger_if_passed(callback_context: CallbackContext):
+    """
+    This callback exits the refinement loop directly when the tests already
+    passed, instead of spending a full LLM call on the debugger just to have
+    it call `exit_loop`.
+    """
+    if _test_status(callback_context.state.get('test_results')) == 'PASS':
+        # Same effect as the `exit_loop` tool: the escalation is attached to
+        # the event the ADK emits for the content returned below.
+        callback_context._event_actions.escalate = True
+        return types.Content(parts=[types.Part(text="All tests passed.")])
+
+
+debugger_and_refiner_agent.instruction = build_debugger_instruction
+debugger_and_refiner_agent.before_agent_callback = skip_debugger_if_passed
 debugger_and_refiner_agent.output_key = "generated_test_code"
 
 
@@ -146,6 +279,16 @@ result_summarizer_agent = LlmAgent(
 """,
 )
 
+# Opt-in exact-match response cache (LLM_CACHE=1) for every model-backed agent.
+enable_llm_cache(
+    code_analyzer_agent,
+    test_case_designer_agent,
+    test_implementer_agent,
+    test_runner_agent,
+    debugger_and_refiner_agent,
+    result_summarizer_agent,
+)
+
 # The root_agent is now a SequentialAgent that controls the deterministic high-level workflow.
 root_agent = SequentialAgent(
     name="CoordinatorAgent",
@@ -0,0 +1,88 @@
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+
+# An exact-match cache for model responses, enabled with `LLM_CACHE=1`.
+# The pipeline is fully deterministic in its inputs, so re-running `main.py`
+# on an unchanged `sample_code.py` (or the refinement loop seeing the same
+# code twice) can reuse earlier responses instead of calling the model again.
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+logger = logging.getLogger("testmozart")
+
+# Per-invocation scratch key; the `temp:` prefix keeps it out of the persisted session.
+_CACHE_KEY_STATE = "temp:llm_cache_key"
+
+# Defaults to the project root (next to `main.py`) regardless of the working directory.
+_DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / ".llm_cache"
+
+_cache = None
+
+
+def _get_cache():
+    """Lazily opens the on-disk cache so importing this module has no side effects."""
+    global _cache
+    if _cache is None:
+        _cache = diskcache.Cache(os.environ.get("LLM_CACHE_DIR", str(_DEFAULT_CACHE_DIR)))
+    return _cache
+
+
+def _request_key(agent_name: str, llm_request: LlmRequest) -> str:
+    """Hashes everything that determines the model's answer into a cache key."""
+    digest = hashlib.blake2b(digest_size=32)
+    digest.update(agent_name.encode())
+    digest.update(b"\0")
+    digest.update((llm_request.model or "").encode())
+    digest.update(b"\0")
+    # The config carries the system instruction as well as the tools, response
+    # schema and generation settings, all of which change the response.
+    if llm_request.config:
+        digest.update(llm_request.config.model_dump_json(exclude_none=True).encode())
+    digest.update(b"\0")
+    for content in llm_request.contents:
+        digest.update(content.model_dump_json(exclude_none=True).encode())
+    return digest.hexdigest()
+
+
+def check_llm_cache(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+    """
+    `before_model_callback` that returns a cached response on an exact match,
+    which makes the ADK skip the model call entirely.
+    """
+    key = _request_key(callback_context.agent_name, llm_request)
+    cached = _get_cache().get(key)
+    if cached is not None:
+        return LlmResponse.model_validate_json(cached)
+    # Remember the key so `store_llm_response` doesn't have to recompute it.
+    callback_context.state[_CACHE_KEY_STATE] = key
+    return None
+
+
+def store_llm_response(callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+    """`after_model_callback` that saves complete, successful responses to the cache."""
+    key = callback_context.state.get(_CACHE_KEY_STATE)
+    if key and not llm_response.partial and not llm_response.error_code:
+        _get_cache().set(key, llm_response.model_dump_json(exclude_none=True))
+        callback_context.state[_CACHE_KEY_STATE] = None
+    return None
+
+
+def enable_llm_cache(*agents) -> None:
+    """Registers the cache callbacks on the given agents if `LLM_CACHE=1` is set."""
+    # Read at call time rather than import time so values loaded from `.env` apply.
+    if os.environ.get("LLM_CACHE") != "1":
+        return
+    if diskcache is None:
+        logger.warning("LLM_CACHE=1 is set but `diskcache` is not installed. Responses will not be cached.")
+        return
+    for agent in agents:
+        agent.before_model_callback = check_llm_cache
+        agent.after_model_callback = store_llm_response
@@ -1,97 +1,149 @@
 import asyncio
-import json
+import logging
 import re
+from pathlib import Path
+from typing import Optional
 from google.adk.runners import Runner
 from google.genai import types
 from google.adk.sessions import InMemorySessionService
 from dotenv import load_dotenv
 
+# Make sure your .env file with GOOGLE_API_KEY is present. It is loaded before
+# the agents are imported, since they read settings like LLM_CACHE at import.
+load_dotenv()
+
 # Import the fully assembled root agent from our coordinator module
-from agents.coordinator import root_agent
+from agents.coordinator import SEEDED_REQUEST_KEY, root_agent
 
 # Use a shared session service for the application
 session_service = InMemorySessionService()
 
+# Input and output files live next to this script, resolved once at import.
+_SCRIPT_DIR = Path(__file__).resolve().parent
+_SAMPLE_CODE_PATH = _SCRIPT_DIR / "sample_code.py"
+_FINAL_TEST_SUITE_PATH = _SCRIPT_DIR / "final_test_suite.py"
+
+# Extracts the python code block from the final agent response
+_PYTHON_BLOCK_PATTERN = re.compile(r"```python\n([\s\S]+?)\n```")
+
+# The runner is built once per process and reused for every request, so
+# serving many source files doesn't repeat agent setup or model client init.
+_RUNNER: Optional[Runner] = None
+
+def get_runner() -> Runner:
+    """Returns the process-wide ADK Runner, creating it on first use."""
+    global _RUNNER
+    if _RUNNER is None:
+        # We pass the shared session_service instance here.
+        _RUNNER = Runner(
+            app_name="autotest_suite_generator",
+            agent=root_agent,
+            session_service=session_service
+        )
+    return _RUNNER
+
+async def run_once(source_code: str, user_id: str = "end_user") -> str:
+    """
+    Runs the full test generation workflow for a single piece of source code.
+
+    Args:
+        source_code: The Python source code to generate tests for.
+        user_id: The user the session is created for.
+
+    Returns:
+        The final response text from the last agent in the workflow.
+    """
+    runner = get_runner()
+
+    # Create a session for this request, seeding it with the code to test.
+    # The `initialize_state` callback on our root agent consumes it from here,
+    # so the source never has to be serialized into (and parsed back out of)
+    # the user message.
+    session = await runner.session_service.create_session(
+        app_name="autotest_suite_generator",
+        user_id=user_id,
+        state={
+            SEEDED_REQUEST_KEY: {
+                "source_code": source_code,
+                "language": "python"
+            }
+        }
+    )
+
+    # The user message only needs to kick off the workflow.
+    user_message = types.Content(
+        role="user",
+        parts=[types.Part(text="Generate a test suite for the source code in the session state.")]
+    )
+
+    # Run the agent system and stream the process
+    final_output = ""
+    try:
+        async for event in runner.run_async(
+            user_id=session.user_id,
+            session_id=session.id,
+            new_message=user_message
+        ):
+            author = event.author
+            text_parts = []
+            # We only care about text parts for this simple log view
+            if event.content and event.content.parts:
+                for part in event.content.parts:
+                    if part.text:
+                        text_parts.append(part.text)
+            content_text = "\n".join(text_parts)
+            
+            # Print agent's textual output as it happens
+            if content_text.strip():
+                print(f"[{author}]: {content_text.strip()}")
+
+            # Capture the final response from the last agent in the sequence
+            if event.is_final_response():
+                final_output = content_text.strip()
+    finally:
+        # Sessions are per request; drop this one so a long-lived process
+        # doesn't keep every request's source, events and test code around.
+        await runner.session_service.delete_session(
+            app_name="autotest_suite_generator",
+            user_id=session.user_id,
+            session_id=session.id
+        )
+
+    return final_output
+
 async def main():
     print("--- Starting Autonomous Test Suite Generation System ---")
     
     # 1. Load the source code we want to test
     try:
-        with open("sample_code.py", "r") as f:
-            source_code_to_test = f.read()
+        # Read bytes and decode once; cheaper than the text-mode decoder.
+        source_code_to_test = _SAMPLE_CODE_PATH.read_bytes().decode("utf-8")
     except FileNotFoundError:
         print("Error: `sample_code.py` not found. Please ensure the file exists.")
         return
 
-    # 2. Instantiate the ADK Runner with our master agent
-    # We pass the shared session_service instance here.
-    runner = Runner(
-        app_name="autotest_suite_generator",
-        agent=root_agent,
-        session_service=session_service
-    )
-    
-    # 3. Create a session for this run
-    session = await runner.session_service.create_session(
-        app_name="autotest_suite_generator",
-        user_id="end_user"
-    )
-
-    # 4. Format the initial user request as a JSON object
-    # The `initialize_state` callback on our root agent will parse this.
-    initial_request = json.dumps({
-        "source_code": source_code_to_test,
-        "language": "python"
-    })
-    
     print(f"\n[USER REQUEST] Generating tests for:\n---\n{source_code_to_test}\n---\n")
 
-    user_message = types.Content(
-        role="user",
-        parts=[types.Part(text=initial_request)]
-    )
-
-    # 5. Run the agent system and stream the process
-    final_output = ""
+    # 2. Run the agent system on the shared runner
     print("\n--- SYSTEM EXECUTION LOG ---")
-    async for event in runner.run_async(
-        user_id=session.user_id,
-        session_id=session.id,
-        new_message=user_message
-    ):
-        author = event.author
-        content_text = ""
-        # We only care about text parts for this simple log view
-        if event.content and event.content.parts:
-            for part in event.content.parts:
-                if part.text:
-                    content_text += part.text + "\n"
-        
-        # Print agent's textual output as it happens
-        if content_text.strip():
-            print(f"[{author}]: {content_text.strip()}")
-
-        # Capture the final response from the last agent in the sequence
-        if event.is_final_response():
-            final_output = content_text.strip()
+    final_output = await run_once(source_code_to_test)
             
     print("\n--- SYSTEM EXECUTION COMPLETE ---")
     print("\n--- FINAL RESULT ---")
     
     print(final_output)
 
-    # Try to extract just the python code block for saving
-    python_code_match = re.search(r"```python\n([\s\S]+?)\n```", final_output, re.DOTALL)
+    # 3. Try to extract just the python code block for saving
+    python_code_match = _PYTHON_BLOCK_PATTERN.search(final_output)
     if python_code_match:
         final_code = python_code_match.group(1).strip()
-        with open("final_test_suite.py", "w") as f:
-            f.write(final_code)
+        _FINAL_TEST_SUITE_PATH.write_text(final_code, encoding="utf-8")
         print("\n--- Final test suite saved to `final_test_suite.py` ---")
     else:
         print("\n--- Could not extract a Python code block to save to file. ---")
 
 
 if __name__ == "__main__":
-    # Make sure your .env file with GOOGLE_API_KEY is present
-    load_dotenv()
+    # A single handler and formatter shared by every logger in the app
+    logging.basicConfig(format="[%(name)s] %(levelname)s: %(message)s")
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,32 @@
+import pytest
+
+# Importing the coordinator builds the agent graph, which needs google-adk.
+coordinator = pytest.importorskip("agents.coordinator")
+
+
+def test_fenced_uses_three_backticks_by_default():
+    assert coordinator._fenced("x = 1") == "```\nx = 1\n```"
+
+
+def test_fenced_outgrows_backtick_runs_in_the_code():
+    code = 'DOC = """\n```python\nprint(1)\n```\n"""'
+    fenced = coordinator._fenced(code)
+    assert fenced == f"````\n{code}\n````"
+
+
+def test_fenced_handles_long_backtick_runs():
+    code = "s = '`````'"
+    assert coordinator._fenced(code).startswith("``````\n")
+
+
+@pytest.mark.parametrize("test_results, status", [
+    ({"status": "PASS"}, "PASS"),
+    ({"status": "UNKNOWN"}, "UNKNOWN"),
+    ('{"status": "FAIL", "summary": "1 failed", "failures": []}', "FAIL"),
+    ('```json\n{"status": "PASS", "summary": "1 passed"}\n```', "PASS"),
+    ("The tests could not be run.", None),
+    ("{not json}", None),
+    (None, None),
+])
+def test_test_status(test_results, status):
+    assert coordinator._test_status(test_results) == status
@@ -0,0 +1,93 @@
+import pytest
+
+from tools import test_design_tools
+from tools.test_design_tools import generate_test_scenarios
+
+
+@pytest.mark.parametrize("text", [
+    "SCENARIO: x\nEXPECTED: y",
+    "SCENARIO: x EXPECTED: y",
+    "**SCENARIO:** x\n**EXPECTED:** y",
+    "**SCENARIO**: x\n**EXPECTED**: y",
+    "1. SCENARIO: x\n2. EXPECTED: y",
+    "* SCENARIO: x\n* EXPECTED: y",
+    "- **SCENARIO:** x\n- **EXPECTED:** y",
+    "- Description: x\n- Expected Outcome: y",
+])
+def test_parses_common_scenario_formats(text):
+    assert generate_test_scenarios(text) == [{"description": "x", "expected_outcome": "y"}]
+
+
+def test_splits_blocks_on_separator():
+    text = (
+        "SCENARIO: Test 'add' with two positive integers.\n"
+        "EXPECTED: Returns the sum.\n"
+        "---\n"
+        "SCENARIO: Test 'greet' with an empty string.\n"
+        "EXPECTED: Returns 'Hello, '.\n"
+    )
+    assert generate_test_scenarios(text) == [
+        {"description": "Test 'add' with two positive integers.", "expected_outcome": "Returns the sum."},
+        {"description": "Test 'greet' with an empty string.", "expected_outcome": "Returns 'Hello, '."},
+    ]
+
+
+def test_multiline_values_are_kept():
+    text = "SCENARIO: Test the parser\nacross lines.\nEXPECTED: It works\nas expected."
+    assert generate_test_scenarios(text) == [
+        {"description": "Test the parser\nacross lines.", "expected_outcome": "It works\nas expected."}
+    ]
+
+
+def test_header_words_inside_other_words_are_ignored():
+    text = "SCENARIO: Handle UNEXPECTED: input\nEXPECTED: Raises ValueError."
+    assert generate_test_scenarios(text) == [
+        {"description": "Handle UNEXPECTED: input", "expected_outcome": "Raises ValueError."}
+    ]
+
+
+@pytest.mark.parametrize("text, expected", [
+    (
+        "SCENARIO: Verify the description: field is rendered\nEXPECTED: It is shown.",
+        {"description": "Verify the description: field is rendered", "expected_outcome": "It is shown."},
+    ),
+    (
+        "SCENARIO: Pass a string.\nEXPECTED: Raises ValueError with message 'Expected: int'",
+        {"description": "Pass a string.", "expected_outcome": "Raises ValueError with message 'Expected: int'"},
+    ),
+    (
+        "SCENARIO: Edge case scenario: empty list\nEXPECTED: Returns an empty list.",
+        {"description": "Edge case scenario: empty list", "expected_outcome": "Returns an empty list."},
+    ),
+])
+def test_repeated_header_words_stay_in_the_value(text, expected):
+    assert generate_test_scenarios(text) == [expected]
+
+
+def test_parses_every_pair_in_a_block_without_separators():
+    text = "SCENARIO: a\nEXPECTED: b\nSCENARIO: c\nEXPECTED: d"
+    assert generate_test_scenarios(text) == [
+        {"description": "a", "expected_outcome": "b"},
+        {"description": "c", "expected_outcome": "d"},
+    ]
+
+
+def test_raises_when_nothing_parses():
+    with pytest.raises(ValueError):
+        generate_test_scenarios("No scenarios here.")
+
+
+def test_skips_only_blocks_that_fail_validation(monkeypatch, capsys):
+    # The parser never yields blank values itself, so feed one in directly to
+    # exercise the per-block validation fallback.
+    def parse(block):
+        return [(" ", "bad outcome")] if "bad" in block else [("good", "good outcome")]
+
+    monkeypatch.setattr(test_design_tools, "_parse_scenario_block", parse)
+    result = generate_test_scenarios("good block\n---\nbad block\n---\ngood block")
+
+    assert result == [{"description": "good", "expected_outcome": "good outcome"}] * 2
+    output = capsys.readouterr().out
+    assert output.count("Warning: Skipping scenario block") == 1
+    assert "description: String should have at least 1 character" in output
+    assert "bad block" in output
@@ -0,0 +1,17 @@
+from tools.test_execution_tools import execute_and_parse_tests
+
+SOURCE_CODE = "def add(a, b):\n    return a + b\n"
+
+
+def test_execute_and_parse_tests_reports_pass():
+    tests = "from source_to_test import add\n\ndef test_add():\n    assert add(2, 2) == 4\n"
+    result = execute_and_parse_tests(SOURCE_CODE, tests)
+    assert result["status"] == "PASS"
+    assert result["failures"] == []
+
+
+def test_execute_and_parse_tests_reports_failures():
+    tests = "from source_to_test import add\n\ndef test_add():\n    assert add(2, 2) == 5\n"
+    result = execute_and_parse_tests(SOURCE_CODE, tests)
+    assert result["status"] == "FAIL"
+    assert [failure["test_name"] for failure in result["failures"]] == ["test_add"]
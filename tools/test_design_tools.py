@@ -1,15 +1,76 @@
 import re
-from typing import Any, Dict, List
-from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
 
 # Pydantic models define the strict JSON schema for our test scenarios.
 # This ensures data consistency between the TestCaseDesigner and TestImplementer agents.
 
 class TestScenario(BaseModel):
     """Represents a single abstract test scenario."""
+    # Scenarios are immutable value objects. Whitespace is stripped during
+    # validation, so the parser can hand over the raw header values.
+    model_config = ConfigDict(frozen=True, extra='forbid', str_strip_whitespace=True, str_min_length=1)
+
     description: str = Field(..., description="A clear, concise description of what is being tested.")
     expected_outcome: str = Field(..., description="The expected result or behavior of the code under this test scenario.")
 
+# Validates a whole list of scenarios in a single pass instead of building
+# and dumping one model per block.
+_SCENARIO_LIST_ADAPTER = TypeAdapter(List[TestScenario])
+
+# Matches the field headers inside a scenario block, including bold markup
+# around the header (`**SCENARIO:**`); `\b` keeps words like "UNEXPECTED" from
+# matching. The `anchor` group only takes part when the header starts a line,
+# optionally after a list marker (`-`, `*`, `1.`). A single finditer pass
+# walks the block left to right with no backtracking over the values.
+_HEADER_PATTERN = re.compile(
+    r"(?im)(?P<anchor>^[ \t]*(?:(?:[-*]|\d+[.)])[ \t]+)?)?\**\b(?P<hdr>Description|SCENARIO|Expected Outcome|EXPECTED)\b\**[ \t]*:\**\s*"
+)
+_DESCRIPTION_HEADERS = ("description", "scenario")
+
+def _parse_scenario_block(block: str) -> List[Tuple[str, str]]:
+    """
+    Extracts the (description, expected_outcome) pairs from a single scenario block.
+
+    A description header at the start of a line begins a new scenario, so a
+    block holding several pairs without '---' separators yields all of them.
+    Any other header whose field is already filled is treated as literal text
+    (e.g. "Verify the description: field"), so values are never truncated.
+    """
+    pairs = []
+    fields: Dict[str, List[str]] = {}
+    current: Optional[str] = None
+    position = 0
+
+    def flush():
+        description = "".join(fields.get("description", []))
+        expected_outcome = "".join(fields.get("expected_outcome", []))
+        if description.strip() and expected_outcome.strip():
+            pairs.append((description, expected_outcome))
+
+    for match in _HEADER_PATTERN.finditer(block):
+        if current is not None:
+            fields[current].append(block[position:match.start()])
+        position = match.end()
+
+        field = "description" if match.group("hdr").lower() in _DESCRIPTION_HEADERS else "expected_outcome"
+        if field in fields:
+            if field == "description" and match.group("anchor") is not None:
+                flush()
+                fields = {}
+            else:
+                fields[current].append(match.group(0))
+                continue
+
+        fields[field] = []
+        current = field
+
+    if current is not None:
+        fields[current].append(block[position:])
+    flush()
+
+    return pairs
+
 def generate_test_scenarios(natural_language_output: str) -> List[Dict[str, Any]]:
     """
     Takes a natural-language string of test scenarios from an LLM and parses
@@ -22,35 +83,39 @@ def generate_test_scenarios(natural_language_output: str) -> List[Dict[str, Any]
     Returns:
         A list of dictionaries, where each dictionary conforms to the TestScenario schema.
     """
-    scenarios = []
+    raw_scenarios = []
+    raw_blocks = []
     
     # Split the output into individual scenario blocks based on a separator '---'.
-    scenario_blocks = natural_language_output.strip().split('---')
+    # A plain str.split is enough; blank blocks and surrounding whitespace are
+    # dropped below, so the whole output doesn't need to be stripped first.
+    scenario_blocks = natural_language_output.split('---')
 
     for block in scenario_blocks:
         if not block.strip():
             continue
 
-        # Use regex to find the content for description and expected outcome.
-        # The re.DOTALL flag allows '.' to match newlines.
-        desc_match = re.search(r"SCENARIO:\s*(.+?)\s*EXPECTED:", block, re.DOTALL | re.IGNORECASE)
-        outcome_match = re.search(r"EXPECTED:\s*(.+)", block, re.DOTALL | re.IGNORECASE)
-
-        if desc_match and outcome_match:
-            description = desc_match.group(1).strip()
-            expected_outcome = outcome_match.group(1).strip()
-            
-            try:
-                # Validate data against the Pydantic model
-                scenario_obj = TestScenario(
-                    description=description,
-                    expected_outcome=expected_outcome
-                )
-                # Append the validated data as a dictionary
-                scenarios.append(scenario_obj.model_dump())
-            except Exception as e:
-                # Skip blocks that fail validation
-                print(f"Warning: Skipping scenario block due to validation error: {e}\nBlock content:\n{block}")
+        for description, expected_outcome in _parse_scenario_block(block):
+            raw_scenarios.append({"description": description, "expected_outcome": expected_outcome})
+            raw_blocks.append(block)
+
+    # Validate data against the Pydantic model
+    try:
+        validated = _SCENARIO_LIST_ADAPTER.validate_python(raw_scenarios)
+    except ValidationError as e:
+        # Skip blocks that fail validation and validate the rest again
+        invalid: Dict[int, List[str]] = {}
+        for error in e.errors():
+            index, *field = error["loc"]
+            invalid.setdefault(index, []).append(f"{'.'.join(map(str, field))}: {error['msg']}")
+        for index in sorted(invalid):
+            print(f"Warning: Skipping scenario block due to validation error: {'; '.join(invalid[index])}\nBlock content:\n{raw_blocks[index]}")
+        validated = _SCENARIO_LIST_ADAPTER.validate_python(
+            [scenario for index, scenario in enumerate(raw_scenarios) if index not in invalid]
+        )
+
+    # Return the validated data as dictionaries
+    scenarios = _SCENARIO_LIST_ADAPTER.dump_python(validated)
 
     if not scenarios:
         raise ValueError("Could not parse any valid scenarios from the provided text.")
@@ -198,4 +198,21 @@ def parse_test_results(raw_execution_output: Dict[str, Any]) -> Dict[str, Any]:
             ))
 
     result = TestResult(status=status, summary=summary, failures=failures)
-    return result.model_dump()
\ No newline at end of file
+    return result.model_dump()
+
+def execute_and_parse_tests(source_code_under_test: str, generated_test_code: str) -> Dict[str, Any]:
+    """
+    Executes generated tests against source code and parses the results in a single step.
+
+    This combines `execute_tests_sandboxed` and `parse_test_results` so the agent
+    does not need a second tool call (and LLM turn) just to pass the raw output along.
+
+    Args:
+        source_code_under_test: The original source code as a string.
+        generated_test_code: The generated pytest test code as a string.
+
+    Returns:
+        A dictionary conforming to the TestResult schema.
+    """
+    raw_execution_output = execute_tests_sandboxed(source_code_under_test, generated_test_code)
+    return parse_test_results(raw_execution_output)